@@ -1,12 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
-from django.contrib import admin
 from .models import (
     ProductSize, FabricType, PrintPattern, ProductSKU,
     InventoryLocation, InventoryBalance, InventoryMovement,
     FabricMaterial, FabricInventory, FabricPrintJob,
-    Customer, OrderStatus, Order, OrderItem,
+    Customer, OrderStatus, Order, OrderItem, OrderStatusHistory,
     ExpenseType, Expense,
 )
 
@@ -14,27 +12,74 @@ from .models import (
 class ProductSKUAdmin(admin.ModelAdmin):
     list_display = ("sku_code", "size", "fabric_type", "print_pattern", "unit_price", "is_active")
     list_filter = ("size", "fabric_type", "print_pattern", "is_active")
+    list_select_related = ("size", "fabric_type", "print_pattern")
     search_fields = ("sku_code",)
     readonly_fields = ("sku_code",)
 
 
-admin.site.register(ProductSize)
-admin.site.register(FabricType)
-admin.site.register(PrintPattern)
+@admin.register(InventoryBalance)
+class InventoryBalanceAdmin(admin.ModelAdmin):
+    list_display = ("sku", "location", "qty_on_hand", "reorder_level")
+    list_select_related = ("sku", "location")
+    raw_id_fields = ("sku",)
+
+
+@admin.register(InventoryMovement)
+class InventoryMovementAdmin(admin.ModelAdmin):
+    list_display = ("movement_type", "qty", "sku", "location", "created_at")
+    list_select_related = ("sku", "location")
+    raw_id_fields = ("sku",)
+
+
+@admin.register(FabricMaterial)
+class FabricMaterialAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "uom", "is_printed")
+    list_select_related = ("fabric_type", "print_pattern")
+
+
+@admin.register(FabricInventory)
+class FabricInventoryAdmin(admin.ModelAdmin):
+    list_display = ("fabric_material", "location", "qty_on_hand")
+    list_select_related = ("fabric_material__fabric_type", "fabric_material__print_pattern", "location")
+
+
+@admin.register(FabricPrintJob)
+class FabricPrintJobAdmin(admin.ModelAdmin):
+    list_display = ("print_pattern", "input_fabric_material", "input_qty", "output_fabric_material", "output_qty")
+    list_select_related = (
+        "print_pattern",
+        "input_fabric_material__fabric_type",
+        "input_fabric_material__print_pattern",
+        "output_fabric_material__fabric_type",
+        "output_fabric_material__print_pattern",
+    )
+
+
+@admin.register(OrderItem)
+class OrderItemAdmin(admin.ModelAdmin):
+    list_display = ("order", "sku", "qty", "unit_price", "line_total")
+    list_select_related = ("order", "sku")
+    raw_id_fields = ("order", "sku")
+
 
+@admin.register(OrderStatusHistory)
+class OrderStatusHistoryAdmin(admin.ModelAdmin):
+    list_display = ("order", "from_status", "to_status", "created_at")
+    list_select_related = ("order", "from_status", "to_status")
+    raw_id_fields = ("order",)
 
-admin.site.register(InventoryLocation)
-admin.site.register(InventoryBalance)
-admin.site.register(InventoryMovement)
 
-admin.site.register(FabricMaterial)
-admin.site.register(FabricInventory)
-admin.site.register(FabricPrintJob)
+@admin.register(Expense)
+class ExpenseAdmin(admin.ModelAdmin):
+    list_display = ("expense_type", "amount", "currency", "expense_date", "vendor")
+    list_select_related = ("expense_type",)
 
-admin.site.register(Customer)
-admin.site.register(OrderStatus)
-admin.site.register(Order)
-admin.site.register(OrderItem)
 
-admin.site.register(ExpenseType)
-admin.site.register(Expense)
+# Plain lookup tables: their __str__ only reads local columns.
+for model in (
+    ProductSize, FabricType, PrintPattern,
+    InventoryLocation,
+    Customer, OrderStatus, Order,
+    ExpenseType,
+):
+    admin.site.register(model)
@@ -6,8 +6,14 @@ from decimal import Decimal
 from pathlib import Path
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+try:
+    import ijson
+except ImportError:  # optional: without it the seed file is loaded whole
+    ijson = None
 
 from ops.models import (
     ProductSize, FabricType, PrintPattern, ProductSKU,
@@ -15,18 +21,34 @@ from ops.models import (
     FabricMaterial, FabricInventory,
     Customer, OrderStatus, Order, OrderItem,
     ExpenseType, Expense,
+    build_sku_code,
 )
 
-# If you already added auto SKU generation in ProductSKU.save(),
-# you can rely on that. Otherwise, we build one here when missing.
-def build_sku_code(size: ProductSize, fabric: FabricType, pattern: PrintPattern | None) -> str:
-    size_code = (size.code or "").upper()
-    fabric_code = (fabric.name or "").strip().upper().replace(" ", "")[:10]
-    if pattern is None:
-        print_code = "PLAIN"
-    else:
-        print_code = (pattern.name or "").strip().upper().replace(" ", "")[:12]
-    return f"BAG-{size_code}-{fabric_code}-{print_code}"
+BATCH_SIZE = 500
+
+
+def to_decimal(value, default: str = "0") -> Decimal:
+    # Numbers already arrive as Decimal (json parse_float / ijson); strings and
+    # ints are the only things left to convert.
+    if isinstance(value, Decimal):
+        return value
+    if value is None:
+        return Decimal(default)
+    return Decimal(str(value))
+
+
+class StreamedSeed:
+    """
+    Dict-like view over a seed file that parses one top-level section per
+    .get() call, so only the section being seeded is ever held in memory.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def get(self, key: str, default=None):
+        with self.path.open("rb") as f:
+            yield from ijson.items(f, f"{key}.item")
 
 
 class Command(BaseCommand):
@@ -39,17 +61,35 @@ class Command(BaseCommand):
             default="seed_data.json",
             help="Path to seed_data.json (default: ./seed_data.json)",
         )
+        parser.add_argument(
+            "--fresh",
+            action="store_true",
+            help="Target tables are empty: load the bulk tables with PostgreSQL COPY instead of INSERT.",
+        )
 
     def handle(self, *args, **options):
         path = Path(options["path"]).resolve()
         if not path.exists():
             raise SystemExit(f"Seed file not found: {path}")
+        self._fresh = options["fresh"]
+        # One clock read for the whole run, stamped on every row this command
+        # writes outside of the INSERT path (COPY, upsert updates, bulk_update).
+        self._now = timezone.now()
 
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        if ijson is not None:
+            data = StreamedSeed(path)
+        else:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f, parse_float=Decimal)
 
         with transaction.atomic():
+            # Django already creates PostgreSQL foreign keys as DEFERRABLE INITIALLY
+            # DEFERRED; say so explicitly so every deferrable check runs once at COMMIT.
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET CONSTRAINTS ALL DEFERRED")
             self._seed_reference(data)
+            self._load_reference_cache()
             self._seed_skus_and_inventory(data)
             self._seed_fabrics(data)
             self._seed_orders(data)
@@ -58,194 +98,367 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("✅ Seeding completed."))
 
     # ---------- helpers ----------
+    def _load_reference_cache(self):
+        # Reference tables are small and fixed once _seed_reference has run, so
+        # every later lookup is served from memory instead of a .get() per row.
+        self._sizes = {s.code: s for s in ProductSize.objects.all()}
+        self._fabrics = {f.name: f for f in FabricType.objects.all()}
+        self._prints = {p.name: p for p in PrintPattern.objects.all()}
+        self._locs = {loc.name: loc for loc in InventoryLocation.objects.all()}
+        self._customers = {c.full_name: c for c in Customer.objects.all()}
+        self._statuses = {st.code: st for st in OrderStatus.objects.all()}
+        self._load_sku_cache()
+
+    def _load_sku_cache(self):
+        # Keyed by the natural names the seed JSON uses, so _get_sku is a single
+        # dict lookup with no name -> instance -> id translation.
+        self._skus = {
+            (sku.size.code, sku.fabric_type.name, sku.print_pattern.name if sku.print_pattern else None): sku
+            for sku in ProductSKU.objects.select_related("size", "fabric_type", "print_pattern")
+        }
+
     def _get_size(self, code: str) -> ProductSize:
-        return ProductSize.objects.get(code=code)
+        return self._sizes[code]
 
     def _get_fabric(self, name: str) -> FabricType:
-        return FabricType.objects.get(name=name)
+        return self._fabrics[name]
 
     def _get_print(self, name: str | None) -> PrintPattern | None:
         if name is None:
             return None
-        return PrintPattern.objects.get(name=name)
+        return self._prints[name]
 
     def _get_location(self, name: str) -> InventoryLocation:
-        return InventoryLocation.objects.get(name=name)
+        return self._locs[name]
 
     def _get_sku(self, size_code: str, fabric_name: str, print_name: str | None) -> ProductSKU:
-        size = self._get_size(size_code)
-        fabric = self._get_fabric(fabric_name)
-        pattern = self._get_print(print_name)
-
-        sku, created = ProductSKU.objects.get_or_create(
-            size=size,
-            fabric_type=fabric,
-            print_pattern=pattern,
-            defaults={
-                "sku_code": build_sku_code(size, fabric, pattern),
-                "unit_price": Decimal("0.00"),
-                "is_active": True,
-            },
-        )
-        # Ensure sku_code exists if field was blank
-        if not sku.sku_code:
-            sku.sku_code = build_sku_code(size, fabric, pattern)
-            sku.save(update_fields=["sku_code"])
+        key = (size_code, fabric_name, print_name)
+        sku = self._skus.get(key)
+        if sku is None:
+            size = self._get_size(size_code)
+            fabric = self._get_fabric(fabric_name)
+            pattern = self._get_print(print_name)
+            sku = ProductSKU.objects.create(
+                size=size,
+                fabric_type=fabric,
+                print_pattern=pattern,
+                sku_code=build_sku_code(size, fabric, pattern),
+                unit_price=Decimal("0.00"),
+                is_active=True,
+            )
+            self._skus[key] = sku
         return sku
 
+    def _insert(self, model, objs, **kwargs):
+        """
+        bulk_create(**kwargs), or a COPY FROM STDIN stream on --fresh runs against
+        PostgreSQL with psycopg 3. COPY has no ON CONFLICT and returns no primary
+        keys, so it is only used for tables that start empty and whose rows
+        aren't referenced by id afterwards (or are reloaded into a cache).
+        """
+        objs = list(objs)
+        if not (self._fresh and objs and connection.vendor == "postgresql"):
+            return model.objects.bulk_create(objs, batch_size=BATCH_SIZE, **kwargs)
+        with connection.cursor() as cursor:
+            if not hasattr(cursor, "copy"):  # psycopg2
+                return model.objects.bulk_create(objs, batch_size=BATCH_SIZE, **kwargs)
+            fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+            columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+            table = connection.ops.quote_name(model._meta.db_table)
+            with cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                for obj in objs:
+                    # Unlike bulk_create, nothing runs pre_save here, so stamp the
+                    # timestamps by hand.
+                    obj.created_at = obj.updated_at = self._now
+                    copy.write_row([f.get_db_prep_save(getattr(obj, f.attname), connection) for f in fields])
+        return objs
+
+    def _fabric_material_key(self, row: dict) -> tuple:
+        fabric = self._get_fabric(row["fabric_type"])
+        is_printed = bool(row.get("is_printed", False))
+        pattern = self._get_print(row.get("print_pattern")) if is_printed else None
+        return (fabric.id, row.get("uom", "meter"), is_printed, pattern.id if pattern else None)
+
+    def _load_fabric_material_cache(self):
+        self._fabric_mats = {
+            (fm.fabric_type_id, fm.uom, fm.is_printed, fm.print_pattern_id): fm
+            for fm in FabricMaterial.objects.all()
+        }
+
     # ---------- seed steps ----------
     def _seed_reference(self, data: dict):
+        # One upsert per table; rows are keyed by their natural key so a repeated
+        # key in the JSON behaves like update_or_create (last row wins) instead of
+        # hitting the same row twice in a single ON CONFLICT statement.
+
         # Sizes
-        for row in data.get("product_sizes", []):
-            ProductSize.objects.update_or_create(
-                code=row["code"],
-                defaults={"display_name": row.get("display_name", row["code"])},
-            )
+        sizes = {
+            row["code"]: ProductSize(code=row["code"], display_name=row.get("display_name", row["code"]))
+            for row in data.get("product_sizes", [])
+        }
+        ProductSize.objects.bulk_create(
+            sizes.values(),
+            update_conflicts=True,
+            unique_fields=["code"],
+            update_fields=["display_name", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
 
         # Fabrics
-        for row in data.get("fabric_types", []):
-            FabricType.objects.update_or_create(
-                name=row["name"],
-                defaults={"is_active": bool(row.get("is_active", True))},
-            )
+        fabrics = {
+            row["name"]: FabricType(name=row["name"], is_active=bool(row.get("is_active", True)))
+            for row in data.get("fabric_types", [])
+        }
+        FabricType.objects.bulk_create(
+            fabrics.values(),
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["is_active", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
 
         # Prints
-        for row in data.get("print_patterns", []):
-            PrintPattern.objects.update_or_create(
-                name=row["name"],
-                defaults={"is_active": bool(row.get("is_active", True))},
-            )
+        patterns = {
+            row["name"]: PrintPattern(name=row["name"], is_active=bool(row.get("is_active", True)))
+            for row in data.get("print_patterns", [])
+        }
+        PrintPattern.objects.bulk_create(
+            patterns.values(),
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["is_active", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
 
-        # Locations
-        for row in data.get("inventory_locations", []):
-            InventoryLocation.objects.update_or_create(name=row["name"], defaults={})
+        # Locations (nothing to update besides the key itself)
+        locations = {row["name"]: InventoryLocation(name=row["name"]) for row in data.get("inventory_locations", [])}
+        InventoryLocation.objects.bulk_create(locations.values(), ignore_conflicts=True, batch_size=BATCH_SIZE)
 
         # Order statuses
-        for row in data.get("order_statuses", []):
-            OrderStatus.objects.update_or_create(
+        statuses = {
+            row["code"]: OrderStatus(
                 code=row["code"],
-                defaults={
-                    "display_name": row.get("display_name", row["code"]),
-                    "sort_order": int(row.get("sort_order", 0)),
-                },
+                display_name=row.get("display_name", row["code"]),
+                sort_order=int(row.get("sort_order", 0)),
             )
+            for row in data.get("order_statuses", [])
+        }
+        OrderStatus.objects.bulk_create(
+            statuses.values(),
+            update_conflicts=True,
+            unique_fields=["code"],
+            update_fields=["display_name", "sort_order", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
 
-        # Customers
-        for row in data.get("customers", []):
-            Customer.objects.update_or_create(
-                full_name=row["full_name"],
-                defaults={
-                    "phone": row.get("phone", ""),
-                    "email": row.get("email", ""),
-                    "address": row.get("address", ""),
-                },
-            )
+        # Customers: full_name has no unique constraint, so ON CONFLICT can't be
+        # used. Split into existing (bulk_update) and new (bulk_create) instead.
+        customers = {row["full_name"]: row for row in data.get("customers", [])}
+        existing = {c.full_name: c for c in Customer.objects.filter(full_name__in=customers)}
+        to_create, to_update = [], []
+        for full_name, row in customers.items():
+            customer = existing.get(full_name) or Customer(full_name=full_name)
+            customer.phone = row.get("phone", "")
+            customer.email = row.get("email", "")
+            customer.address = row.get("address", "")
+            customer.updated_at = self._now
+            (to_update if customer.pk else to_create).append(customer)
+        Customer.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        Customer.objects.bulk_update(to_update, ["phone", "email", "address", "updated_at"], batch_size=BATCH_SIZE)
 
         # Expense types
-        for row in data.get("expense_types", []):
-            ExpenseType.objects.update_or_create(name=row["name"], defaults={"is_active": True})
+        expense_types = {
+            row["name"]: ExpenseType(name=row["name"], is_active=True) for row in data.get("expense_types", [])
+        }
+        ExpenseType.objects.bulk_create(
+            expense_types.values(),
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["is_active", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
 
     def _seed_skus_and_inventory(self, data: dict):
-        # SKUs
+        # SKUs: insert the missing ones in one batch, then update prices of the
+        # ones that already existed in another.
+        new_skus, priced = {}, {}
         for row in data.get("product_skus", []):
-            sku = self._get_sku(row["size_code"], row["fabric_type"], row.get("print_pattern"))
+            size = self._get_size(row["size_code"])
+            fabric = self._get_fabric(row["fabric_type"])
+            pattern = self._get_print(row.get("print_pattern"))
+            key = (row["size_code"], row["fabric_type"], row.get("print_pattern"))
             # update price if provided
             if "unit_price" in row and row["unit_price"] is not None:
-                sku.unit_price = Decimal(str(row["unit_price"]))
-                sku.is_active = bool(row.get("is_active", True))
-                sku.save(update_fields=["unit_price", "is_active"])
+                priced[key] = (to_decimal(row["unit_price"]), bool(row.get("is_active", True)))
+            if key not in self._skus:
+                new_skus[key] = ProductSKU(
+                    size=size,
+                    fabric_type=fabric,
+                    print_pattern=pattern,
+                    sku_code=build_sku_code(size, fabric, pattern),
+                    unit_price=Decimal("0.00"),
+                    is_active=True,
+                )
+
+        for key, sku in new_skus.items():
+            if key in priced:
+                sku.unit_price, sku.is_active = priced.pop(key)
+        self._insert(ProductSKU, new_skus.values(), ignore_conflicts=True)
+
+        to_update = []
+        for key, (unit_price, is_active) in priced.items():
+            sku = self._skus[key]
+            sku.unit_price = unit_price
+            sku.is_active = is_active
+            sku.updated_at = self._now
+            to_update.append(sku)
+        ProductSKU.objects.bulk_update(to_update, ["unit_price", "is_active", "updated_at"], batch_size=BATCH_SIZE)
+
+        # ignore_conflicts doesn't hand back primary keys, so reload once.
+        if new_skus:
+            self._load_sku_cache()
 
         # Inventory balances
+        balances = {}
         for row in data.get("inventory_balances", []):
             sku = self._get_sku(row["size_code"], row["fabric_type"], row.get("print_pattern"))
             loc = self._get_location(row["location"])
-            InventoryBalance.objects.update_or_create(
+            balances[(sku.id, loc.id)] = InventoryBalance(
                 sku=sku,
                 location=loc,
-                defaults={
-                    "qty_on_hand": int(row.get("qty_on_hand", 0)),
-                    "reorder_level": int(row.get("reorder_level", 0)),
-                },
+                qty_on_hand=int(row.get("qty_on_hand", 0)),
+                reorder_level=int(row.get("reorder_level", 0)),
             )
+        self._insert(
+            InventoryBalance,
+            balances.values(),
+            update_conflicts=True,
+            unique_fields=["sku", "location"],
+            update_fields=["qty_on_hand", "reorder_level", "updated_at"],
+        )
 
     def _seed_fabrics(self, data: dict):
-        # Fabric materials
-        for row in data.get("fabric_materials", []):
-            fabric = self._get_fabric(row["fabric_type"])
-            pattern = self._get_print(row.get("print_pattern"))
-            FabricMaterial.objects.update_or_create(
-                fabric_type=fabric,
-                uom=row.get("uom", "meter"),
-                is_printed=bool(row.get("is_printed", False)),
-                print_pattern=pattern if bool(row.get("is_printed", False)) else None,
-                defaults={},
-            )
+        # Fabric materials: every variant named by either section is created up
+        # front. Raw fabric has a NULL print_pattern, which never conflicts in a
+        # unique index, so missing keys are picked from the cache rather than
+        # relying on ON CONFLICT.
+        self._load_fabric_material_cache()
+        missing = {}
+        for row in [*data.get("fabric_materials", []), *data.get("fabric_inventory", [])]:
+            key = self._fabric_material_key(row)
+            if key not in self._fabric_mats:
+                fabric_id, uom, is_printed, pattern_id = key
+                missing[key] = FabricMaterial(
+                    fabric_type_id=fabric_id,
+                    uom=uom,
+                    is_printed=is_printed,
+                    print_pattern_id=pattern_id,
+                )
+        if missing:
+            self._insert(FabricMaterial, missing.values(), ignore_conflicts=True)
+            self._load_fabric_material_cache()
 
         # Fabric inventory
+        balances = {}
         for row in data.get("fabric_inventory", []):
-            fabric = self._get_fabric(row["fabric_type"])
-            pattern = self._get_print(row.get("print_pattern"))
-            mat, _ = FabricMaterial.objects.get_or_create(
-                fabric_type=fabric,
-                uom=row.get("uom", "meter"),
-                is_printed=bool(row.get("is_printed", False)),
-                print_pattern=pattern if bool(row.get("is_printed", False)) else None,
-            )
+            mat = self._fabric_mats[self._fabric_material_key(row)]
             loc = self._get_location(row["location"])
-            FabricInventory.objects.update_or_create(
+            balances[(mat.id, loc.id)] = FabricInventory(
                 fabric_material=mat,
                 location=loc,
-                defaults={"qty_on_hand": Decimal(str(row.get("qty_on_hand", "0.000")))},
+                qty_on_hand=to_decimal(row.get("qty_on_hand"), "0.000"),
             )
+        self._insert(
+            FabricInventory,
+            balances.values(),
+            update_conflicts=True,
+            unique_fields=["fabric_material", "location"],
+            update_fields=["qty_on_hand", "updated_at"],
+        )
 
     def _seed_orders(self, data: dict):
+        # A repeated order row replaces the earlier row's items, but the order
+        # itself is created from the first occurrence (as the old per-row loop did).
+        order_rows, item_rows = {}, {}
         for row in data.get("orders", []):
-            customer = Customer.objects.get(full_name=row["customer"])
-            status = OrderStatus.objects.get(code=row["status"])
-
+            customer = self._customers[row["customer"]]
+            status = self._statuses[row["status"]]
             # Idempotent-ish: don't duplicate if same ref exists in notes
-            notes = row.get("notes", "")
-            existing = Order.objects.filter(customer=customer, order_date=row["order_date"], notes=notes).first()
-            if existing:
-                order = existing
-            else:
-                order = Order.objects.create(
+            key = (customer.id, parse_date(row["order_date"]), row.get("notes", ""))
+            order_rows.setdefault(key, (customer, status, row))
+            item_rows[key] = row
+
+        # Phase 1: find which orders already exist, in one query.
+        orders = {}
+        if order_rows:
+            existing = Order.objects.filter(
+                customer_id__in={key[0] for key in order_rows},
+                order_date__in={key[1] for key in order_rows},
+            )
+            for order in existing:
+                key = (order.customer_id, order.order_date, order.notes)
+                if key in order_rows:
+                    orders.setdefault(key, order)
+        # Only orders that existed before this run can have items to clear.
+        order_ids_to_clear = [o.pk for o in orders.values()]
+
+        # Phase 2: create the missing ones.
+        new_orders = []
+        for key, (customer, status, row) in order_rows.items():
+            if key not in orders:
+                orders[key] = Order(
                     customer=customer,
                     status=status,
-                    order_date=row["order_date"],
-                    notes=notes,
-                    shipping_fee=Decimal(str(row.get("shipping_fee", "0.00"))),
-                    discount=Decimal(str(row.get("discount", "0.00"))),
+                    order_date=key[1],
+                    notes=key[2],
+                    shipping_fee=to_decimal(row.get("shipping_fee"), "0.00"),
+                    discount=to_decimal(row.get("discount"), "0.00"),
                 )
-
-            # Clear old items to keep deterministic
-            order.items.all().delete()
-
-            subtotal = Decimal("0.00")
+                new_orders.append(orders[key])
+        Order.objects.bulk_create(new_orders, batch_size=BATCH_SIZE)
+
+        # Phase 3: clear old items to keep deterministic
+        if order_ids_to_clear:
+            OrderItem.objects.filter(order_id__in=order_ids_to_clear).delete()
+
+        # Phase 4: build every item across every order and insert them at once.
+        items = []
+        for key, row in item_rows.items():
+            order = orders[key]
+            order.subtotal = Decimal("0.00")
             for item in row.get("items", []):
                 sku = self._get_sku(item["size_code"], item["fabric_type"], item.get("print_pattern"))
                 qty = int(item["qty"])
-                unit_price = Decimal(str(item.get("unit_price", sku.unit_price)))
+                unit_price = to_decimal(item.get("unit_price", sku.unit_price))
                 line_total = unit_price * qty
-                OrderItem.objects.create(
-                    order=order,
-                    sku=sku,
-                    qty=qty,
-                    unit_price=unit_price,
-                    line_total=line_total,
+                items.append(
+                    OrderItem(
+                        order=order,
+                        sku=sku,
+                        qty=qty,
+                        unit_price=unit_price,
+                        line_total=line_total,
+                    )
                 )
-                subtotal += line_total
-
-            order.subtotal = subtotal
-            order.total = subtotal + Decimal(str(order.shipping_fee)) - Decimal(str(order.discount))
-            order.save(update_fields=["subtotal", "total", "shipping_fee", "discount"])
+                order.subtotal += line_total
+        self._insert(OrderItem, items)
+
+        # Phase 5: write the totals back.
+        for order in orders.values():
+            order.total = order.subtotal + order.shipping_fee - order.discount
+            order.updated_at = self._now
+        Order.objects.bulk_update(
+            orders.values(),
+            ["subtotal", "total", "shipping_fee", "discount", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
 
     def _seed_expenses(self, data: dict):
         for row in data.get("expenses", []):
             et = ExpenseType.objects.get(name=row["expense_type"])
             Expense.objects.update_or_create(
                 expense_type=et,
-                amount=Decimal(str(row["amount"])),
+                amount=to_decimal(row["amount"]),
                 expense_date=row["expense_date"],
                 defaults={
                     "currency": row.get("currency", "EGP"),
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ops', '0002_alter_productsku_sku_code'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer', 'order_date'], name='ops_order_custome_5b0c23_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 from django.db import models
 from django.core.validators import MinValueValidator
 # ops/models.py
@@ -13,14 +15,20 @@ def build_sku_code(size, fabric_type, print_pattern) -> str:
       BAG-BABY-CANVAS-P03
       BAG-LRG-COTTON-FLOWERS
     """
-    size_code = (size.code or "").upper()
-    fabric_code = slugify(fabric_type.name).upper().replace("-", "")[:10]  # COTTON, CANVAS...
-    if print_pattern is None:
+    return _sku_code(size.code, fabric_type.name, print_pattern.name if print_pattern else None)
+
+
+@lru_cache(maxsize=None)
+def _sku_code(size_code: str, fabric_name: str, print_name: str | None) -> str:
+    # Memoized on the natural names: the seed builds the same few codes over and over.
+    size_code = (size_code or "").upper()
+    fabric_code = slugify(fabric_name).upper().replace("-", "")[:10]  # COTTON, CANVAS...
+    if print_name is None:
         print_code = "PLAIN"
     else:
         # you can choose one of these styles:
         # print_code = f"P{print_pattern.id:02d}"   # P03
-        print_code = slugify(print_pattern.name).upper().replace("-", "")[:12]  # FLOWERS
+        print_code = slugify(print_name).upper().replace("-", "")[:12]  # FLOWERS
     return f"BAG-{size_code}-{fabric_code}-{print_code}"
 
 
@@ -243,6 +251,11 @@ class Order(TimeStampedModel):
     discount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["customer", "order_date"]),
+        ]
+
     def __str__(self) -> str:
         return f"Order #{self.id}"
 
@@ -255,7 +268,8 @@ class OrderItem(TimeStampedModel):
     line_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
     def __str__(self) -> str:
-        return f"{self.order} - {self.sku} x{self.qty}"
+        # FK ids only, so logging an item never costs a query.
+        return f"Order #{self.order_id} - SKU #{self.sku_id} x{self.qty}"
 
 
 class OrderStatusHistory(TimeStampedModel):
@@ -264,7 +278,7 @@ class OrderStatusHistory(TimeStampedModel):
     to_status = models.ForeignKey(OrderStatus, on_delete=models.PROTECT, related_name="+")
 
     def __str__(self) -> str:
-        return f"{self.order}: {self.from_status} -> {self.to_status}"
+        return f"Order #{self.order_id}: {self.from_status} -> {self.to_status}"
 
 
 # -------------------- Expenses --------------------
@@ -1,3 +1,29 @@
+from io import StringIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from .models import ProductSKU, build_sku_code
+
+
+class SeedOpsTests(TestCase):
+    seed_path = str(settings.BASE_DIR / "seed_data.json")
+
+    def seed(self):
+        call_command("seed_ops", path=self.seed_path, stdout=StringIO())
+
+    def row_counts(self):
+        return {model.__name__: model.objects.count() for model in apps.get_app_config("ops").get_models()}
+
+    def test_reseed_inserts_no_new_rows(self):
+        self.seed()
+        first = self.row_counts()
+        self.seed()
+        self.assertEqual(self.row_counts(), first)
+
+    def test_seeded_sku_codes_match_model_builder(self):
+        self.seed()
+        for sku in ProductSKU.objects.select_related("size", "fabric_type", "print_pattern"):
+            self.assertEqual(sku.sku_code, build_sku_code(sku.size, sku.fabric_type, sku.print_pattern))